@@ -1,4 +1,5 @@
 from .server import A2AServer
+from .cors import PermissiveCORSMiddleware
 from .task_manager import TaskManager, InMemoryTaskManager
 
-__all__ = ["A2AServer", "TaskManager", "InMemoryTaskManager"]
+__all__ = ["A2AServer", "PermissiveCORSMiddleware", "TaskManager", "InMemoryTaskManager"]
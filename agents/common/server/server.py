@@ -1,5 +1,5 @@
 from starlette.applications import Starlette
-from starlette.responses import JSONResponse
+from starlette.responses import JSONResponse, Response
 from sse_starlette.sse import EventSourceResponse
 from starlette.requests import Request
 from common.types import (
@@ -19,6 +19,8 @@ from common.types import (
 )
 from pydantic import ValidationError
 import json
+import orjson
+import sys
 from typing import AsyncIterable, Any
 from common.server.task_manager import TaskManager
 
@@ -27,6 +29,13 @@ import logging
 logger = logging.getLogger(__name__)
 
 
+class ORJSONResponse(JSONResponse):
+    """A JSONResponse rendered with orjson, which encodes straight to bytes."""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+
 class A2AServer:
     def __init__(
         self,
@@ -41,6 +50,7 @@ class A2AServer:
         self.endpoint = endpoint
         self.task_manager = task_manager
         self.agent_card = agent_card
+        self._agent_card_json: bytes | None = None
         self.app = Starlette()
 
         self.app.add_route(self.endpoint, self._process_request, methods=["POST"])
@@ -57,10 +67,23 @@ class A2AServer:
 
         import uvicorn
 
-        uvicorn.run(self.app, host=self.host, port=self.port)
+        # uvloop is a dependency everywhere but Windows; requesting it explicitly makes a broken
+        # install fail loudly instead of silently streaming on the slower default loop.
+        # A2A streams over SSE, so the websocket protocol is not needed.
+        uvicorn.run(
+            self.app,
+            host=self.host,
+            port=self.port,
+            loop="asyncio" if sys.platform == "win32" else "uvloop",
+            http="httptools",
+            ws="none",
+        )
 
-    def _get_agent_card(self, request: Request) -> JSONResponse:
-        return JSONResponse(self.agent_card.model_dump(exclude_none=True))
+    def _get_agent_card(self, request: Request) -> Response:
+        # The card does not change once the server is up, so it is serialized only once.
+        if self._agent_card_json is None:
+            self._agent_card_json = self.agent_card.model_dump_json(exclude_none=True).encode()
+        return Response(content=self._agent_card_json, media_type="application/json")
 
     async def _process_request(self, request: Request):
         try:
@@ -94,7 +117,7 @@ class A2AServer:
         except Exception as e:
             return self._handle_exception(e)
 
-    def _handle_exception(self, e: Exception) -> JSONResponse:
+    def _handle_exception(self, e: Exception) -> ORJSONResponse:
         if isinstance(e, json.decoder.JSONDecodeError):
             json_rpc_error = JSONParseError()
         elif isinstance(e, ValidationError):
@@ -104,9 +127,9 @@ class A2AServer:
             json_rpc_error = InternalError()
 
         response = JSONRPCResponse(id=None, error=json_rpc_error)
-        return JSONResponse(response.model_dump(exclude_none=True), status_code=400)
+        return ORJSONResponse(response.model_dump(exclude_none=True), status_code=400)
 
-    def _create_response(self, result: Any) -> JSONResponse | EventSourceResponse:
+    def _create_response(self, result: Any) -> ORJSONResponse | EventSourceResponse:
         if isinstance(result, AsyncIterable):
 
             async def event_generator(result) -> AsyncIterable[dict[str, str]]:
@@ -115,7 +138,7 @@ class A2AServer:
 
             return EventSourceResponse(event_generator(result))
         elif isinstance(result, JSONRPCResponse):
-            return JSONResponse(result.model_dump(exclude_none=True))
+            return ORJSONResponse(result.model_dump(exclude_none=True))
         else:
             logger.error(f"Unexpected result type: {type(result)}")
             raise ValueError(f"Unexpected result type: {type(result)}")
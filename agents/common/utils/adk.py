@@ -0,0 +1,25 @@
+"""Helpers shared by the ADK-based agents."""
+
+import os
+
+from google.adk.sessions import BaseSessionService, InMemorySessionService
+from google.genai import types
+
+
+def build_session_service() -> BaseSessionService:
+    """Returns a session store shared by all workers if SESSION_DB_URL is set, otherwise a per-process one."""
+    db_url = os.getenv("SESSION_DB_URL")
+    if db_url:
+        # Imported on demand: the database backend pulls in SQLAlchemy.
+        from google.adk.sessions import DatabaseSessionService
+
+        return DatabaseSessionService(db_url=db_url)
+    return InMemorySessionService()
+
+
+def construct_user_content(text: str) -> types.Content:
+    """Builds the user message for a query without validation; the shape is fixed and text is a str.
+
+    A new message is built per call rather than cached, since the runner keeps it in the session history.
+    """
+    return types.Content.model_construct(role="user", parts=[types.Part.model_construct(text=text)])
@@ -0,0 +1,44 @@
+"""Event batching utility for streaming agents."""
+
+import time
+from typing import AsyncIterable, Callable, List, TypeVar
+
+T = TypeVar("T")
+
+
+async def batch_events(
+    events: AsyncIterable[T],
+    is_final: Callable[[T], bool],
+    max_size: int = 16,
+    max_delay: float = 0.05,
+) -> AsyncIterable[List[T]]:
+    """Group an async event stream into small batches.
+
+    The first event is flushed right away so clients see progress immediately.
+    Later events are held back until max_size events are pending, or until an
+    event arrives at least max_delay seconds after the previous flush. There is
+    no timer: a held event waits for the next event, or the end of the stream,
+    however long that takes. A final event always flushes the pending batch,
+    and is then its last element.
+
+    Args:
+        events: The source event stream.
+        is_final: Returns True for events that must be delivered without delay.
+        max_size: The maximum number of events in a single batch.
+        max_delay: The minimum number of seconds between two non-final flushes,
+            checked when an event arrives.
+
+    Yields:
+        Non-empty lists of events, in their original order.
+    """
+    batch: List[T] = []
+    last_flush = float("-inf")
+    async for event in events:
+        batch.append(event)
+        now = time.monotonic()
+        if is_final(event) or len(batch) >= max_size or now - last_flush >= max_delay:
+            yield batch
+            batch = []
+            last_flush = now
+    if batch:
+        yield batch
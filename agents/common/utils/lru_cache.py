@@ -0,0 +1,112 @@
+"""Bounded LRU Cache utility."""
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional, Tuple
+
+# Default for get() that cannot be confused with a stored value.
+MISSING = object()
+
+
+def cache_key(*parts: Any) -> str:
+    """Hash the given values into a stable key, ignoring whitespace differences in strings."""
+    normalized = [" ".join(p.split()) if isinstance(p, str) else p for p in parts]
+    return hashlib.sha1(
+        json.dumps(normalized, sort_keys=True, default=str).encode()
+    ).hexdigest()
+
+
+class LRUCache:
+    """A thread-safe, size-bounded cache with least-recently-used eviction.
+
+    Unlike InMemoryCache this is not a singleton: each instance owns its own
+    storage, so it can be used for per-module registries and memoization.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: Optional[float] = None):
+        """Initialize the cache storage.
+
+        Args:
+            maxsize: The maximum number of entries kept before the least
+                recently used one is evicted.
+            ttl: Time to live in seconds for every entry. If None, entries
+                only leave the cache through eviction or deletion.
+        """
+        if maxsize <= 0:
+            raise ValueError("maxsize must be a positive integer")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, Tuple[Any, Optional[float]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _expired(self, expires_at: Optional[float]) -> bool:
+        return expires_at is not None and time.monotonic() > expires_at
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Set a key-value pair, evicting the least recently used entry if full.
+
+        Args:
+            key: The key for the data.
+            value: The data to store.
+        """
+        expires_at = time.monotonic() + self.ttl if self.ttl is not None else None
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Get the value associated with a key and mark it as recently used.
+
+        Args:
+            key: The key for the data.
+            default: The value to return if the key is not found or expired.
+
+        Returns:
+            The cached value, or the default value if not found.
+        """
+        with self._lock:
+            try:
+                value, expires_at = self._data[key]
+            except KeyError:
+                return default
+            if self._expired(expires_at):
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def delete(self, key: Hashable) -> bool:
+        """Delete a specific key-value pair from the cache.
+
+        Args:
+            key: The key to delete.
+
+        Returns:
+            True if the key was found and deleted, False otherwise.
+        """
+        with self._lock:
+            return self._data.pop(key, None) is not None
+
+    def clear(self) -> None:
+        """Remove all data."""
+        with self._lock:
+            self._data.clear()
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return False
+            if self._expired(entry[1]):
+                del self._data[key]
+                return False
+            return True
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._data)
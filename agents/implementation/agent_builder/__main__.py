@@ -1,11 +1,7 @@
-from common.server import A2AServer
 from common.types import AgentCard, AgentCapabilities, AgentSkill, MissingAPIKeyError
-from task_manager import AgentTaskManager
-from agent import AgentBuilderTemplate
 import click
 import os
 import logging
-from starlette.middleware.cors import CORSMiddleware  # Import CORSMiddleware
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -18,6 +14,11 @@ logger = logging.getLogger(__name__)
 @click.option("--host", default="localhost")
 @click.option("--port", default=10005)
 def main(host, port):
+    # Imported here so that --help and liveness probes don't pay for loading ADK, genai and Starlette.
+    from agent import AgentBuilderTemplate
+    from common.server import A2AServer, PermissiveCORSMiddleware
+    from task_manager import AgentTaskManager
+
     try:
         if not os.getenv("GOOGLE_API_KEY"):
             raise MissingAPIKeyError("GOOGLE_API_KEY environment variable not set.")
@@ -55,13 +56,8 @@ def main(host, port):
             host=host,
             port=port,
         )
-        # Add CORSMiddleware to allow requests from any origin (disables CORS restrictions)
-        server.app.add_middleware(
-            CORSMiddleware,
-            allow_origins=["*"],  # Allow all origins
-            allow_methods=["*"],  # Allow all HTTP methods (GET, POST, etc.)
-            allow_headers=["*"],  # Allow all headers
-        )
+        # Allow requests from any origin (disables CORS restrictions)
+        server.app.add_middleware(PermissiveCORSMiddleware)
         server.start()
     except MissingAPIKeyError as e:
         logger.error(f"Error: {e}")
@@ -1,19 +1,36 @@
-import json
-import random
+import itertools
+import orjson
+import secrets
 from typing import Any, AsyncIterable, Dict, Optional
 from google.adk.agents.llm_agent import LlmAgent
-from google.adk.tools.tool_context import ToolContext
 from google.adk.artifacts import InMemoryArtifactService
 from google.adk.memory.in_memory_memory_service import InMemoryMemoryService
 from google.adk.runners import Runner
-from google.adk.sessions import InMemorySessionService
-from google.genai import types
+
+from common.utils.adk import build_session_service, construct_user_content
+from common.utils.event_batching import batch_events
+from common.utils.lru_cache import MISSING, LRUCache, cache_key
+
+__all__ = [
+    "generate_tests",
+    "run_tests",
+    "return_feedback",
+    "run_sde_tests",
+    "return_solution",
+    "AgentBuilderTemplate",
+]
 
 # Local cache of created request_ids for demo purposes.
-task_ids = set()
+task_ids = LRUCache(maxsize=10_000, ttl=3600)
+
+# Tracks QA task IDs for demonstration purposes; bounded so a long-running server does not leak them.
+qa_task_ids = LRUCache(maxsize=10_000, ttl=3600)
 
-# A set to track QA task IDs for demonstration purposes.
-qa_task_ids = set()
+# Monotonic part of generated QA task IDs; the random suffix keeps them unique across processes.
+_task_counter = itertools.count(1)
+
+# Generated test suites keyed by the normalized QA spec they were built from.
+generated_tests_cache = LRUCache(maxsize=1024, ttl=3600)
 
 
 def generate_tests(qa_details: dict[str, Any]) -> dict[str, Any]:
@@ -29,8 +46,24 @@ def generate_tests(qa_details: dict[str, Any]) -> dict[str, Any]:
     Returns:
         dict[str, Any]: A dictionary containing the generated test cases, a unique qa_task_id, and the QA details.
     """
-    qa_task_id = "qa_task_id_" + str(random.randint(1000000, 9999999))
-    qa_task_ids.add(qa_task_id)
+    spec_key = cache_key(
+        qa_details.get('feature'),
+        qa_details.get('test_requirements'),
+        qa_details.get('constraints'),
+    )
+    cached = generated_tests_cache.get(spec_key)
+    if cached is not None:
+        qa_task_id, generated_tests = cached
+        qa_task_ids.set(qa_task_id, True)
+        qa_details['qa_task_id'] = qa_task_id
+        return {
+            "qa_task_id": qa_task_id,
+            "tests": generated_tests,
+            "qa_details": qa_details,
+        }
+
+    qa_task_id = f"qa_task_id_{next(_task_counter)}_{secrets.token_hex(3)}"
+    qa_task_ids.set(qa_task_id, True)
     qa_details['qa_task_id'] = qa_task_id
 
     # Placeholder generated test cases. Replace with actual test generation logic as needed.
@@ -43,6 +76,7 @@ def generate_tests(qa_details: dict[str, Any]) -> dict[str, Any]:
         "    # TODO: Implement the actual test logic here\n"
         "    assert True\n"
     )
+    generated_tests_cache.set(spec_key, (qa_task_id, generated_tests))
     return {
         "qa_task_id": qa_task_id,
         "tests": generated_tests,
@@ -61,7 +95,8 @@ def run_tests(qa_task_id: str, tests: str) -> dict[str, Any]:
     Returns:
         dict[str, Any]: A dictionary containing the qa_task_id and the status/result of the test execution.
     """
-    if qa_task_id not in qa_task_ids:
+    # get() also refreshes the task's recency, so tasks still being tested are not evicted.
+    if qa_task_ids.get(qa_task_id, MISSING) is MISSING:
         return {"qa_task_id": qa_task_id, "status": "Error: Invalid qa_task_id."}
 
     # In a real scenario, dynamically execute the provided test cases.
@@ -92,14 +127,14 @@ def return_feedback(qa_details: dict[str, Any],
         "qa_task_id": qa_details.get("qa_task_id", ""),
         "feedback": (
             f"Test execution status: {tests_info.get('status', 'No status provided')}. "
-            f"QA Details: {json.dumps(qa_details)}. "
+            f"QA Details: {orjson.dumps(qa_details, option=orjson.OPT_NON_STR_KEYS).decode()}. "
             f"{'Additional feedback: ' + feedback_instructions if feedback_instructions else ''}"
         ),
     }
     return feedback_report
 
 
-def run_tests(task_id: str, code: str) -> dict[str, Any]:
+def run_sde_tests(task_id: str, code: str) -> dict[str, Any]:
     """
     Execute tests for the generated code corresponding to the given task_id.
 
@@ -111,7 +146,8 @@ def run_tests(task_id: str, code: str) -> dict[str, Any]:
         dict[str, Any]: A dictionary containing the status and results of the test execution.
     """
     # Verify the task_id exists.
-    if task_id not in task_ids:
+    # get() also refreshes the task's recency, so tasks still being tested are not evicted.
+    if task_ids.get(task_id, MISSING) is MISSING:
         return {"task_id": task_id, "status": "Error: Invalid task_id."}
 
     # In a real-world scenario, you would dynamically run tests against the code.
@@ -163,7 +199,7 @@ class AgentBuilderTemplate:
             app_name=self._agent.name,
             agent=self._agent,
             artifact_service=InMemoryArtifactService(),
-            session_service=InMemorySessionService(),
+            session_service=build_session_service(),
             memory_service=InMemoryMemoryService(),
         )
 
@@ -171,9 +207,7 @@ class AgentBuilderTemplate:
         session = self._runner.session_service.get_session(
             app_name=self._agent.name, user_id=self._user_id, session_id=session_id
         )
-        content = types.Content(
-            role="user", parts=[types.Part.from_text(text=query)]
-        )
+        content = construct_user_content(query)
         if session is None:
             session = self._runner.session_service.create_session(
                 app_name=self._agent.name,
@@ -181,20 +215,21 @@ class AgentBuilderTemplate:
                 state={},
                 session_id=session_id,
             )
-        events = list(self._runner.run(
-            user_id=self._user_id, session_id=session.id, new_message=content
-        ))
-        if not events or not events[-1].content or not events[-1].content.parts:
+        # Only the last event is needed; intermediate tool and partial events are dropped as they arrive.
+        last_event = None
+        for event in self._runner.run(
+                user_id=self._user_id, session_id=session.id, new_message=content
+        ):
+            last_event = event
+        if last_event is None or not last_event.content or not last_event.content.parts:
             return ""
-        return "\n".join([p.text for p in events[-1].content.parts if p.text])
+        return "\n".join([p.text for p in last_event.content.parts if p.text])
 
     async def stream(self, query, session_id) -> AsyncIterable[Dict[str, Any]]:
         session = self._runner.session_service.get_session(
             app_name=self._agent.name, user_id=self._user_id, session_id=session_id
         )
-        content = types.Content(
-            role="user", parts=[types.Part.from_text(text=query)]
-        )
+        content = construct_user_content(query)
         if session is None:
             session = self._runner.session_service.create_session(
                 app_name=self._agent.name,
@@ -202,22 +237,22 @@ class AgentBuilderTemplate:
                 state={},
                 session_id=session_id,
             )
-        async for event in self._runner.run_async(
-                user_id=self._user_id, session_id=session.id, new_message=content
+        async for batch in batch_events(
+                self._runner.run_async(
+                    user_id=self._user_id, session_id=session.id, new_message=content
+                ),
+                is_final=lambda e: e.is_final_response(),
         ):
+            # Intermediate events carry no payload, so a batch is reported as a single update.
+            event = batch[-1]
             if event.is_final_response():
-                response = ""
-                if (
-                        event.content
-                        and event.content.parts
-                        and event.content.parts[0].text
-                ):
-                    response = "\n".join([p.text for p in event.content.parts if p.text])
-                elif (
-                        event.content
-                        and event.content.parts
-                        and any([True for p in event.content.parts if p.function_response])):
-                    response = next((p.function_response.model_dump() for p in event.content.parts))
+                parts = event.content.parts if event.content and event.content.parts else ()
+                texts = [p.text for p in parts if p.text]
+                if texts:
+                    response = "\n".join(texts)
+                else:
+                    function_response = next((p.function_response for p in parts if p.function_response), None)
+                    response = function_response.model_dump() if function_response else ""
                 yield {
                     "is_task_complete": True,
                     "content": response,
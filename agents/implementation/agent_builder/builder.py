@@ -1,11 +1,12 @@
-from common.server import A2AServer
+from common.server import A2AServer, PermissiveCORSMiddleware
 from common.types import AgentCard, AgentCapabilities, AgentSkill, MissingAPIKeyError
 from task_manager import AgentTaskManager
-from agent import AgentBuilderTemplate
+from agent import AgentBuilderTemplate, generate_tests, return_feedback, run_tests
 import click
+from dataclasses import dataclass
 import os
 import logging
-from starlette.middleware.cors import CORSMiddleware  # Import CORSMiddleware
+import textwrap
 from dotenv import load_dotenv
 from google.adk.agents.llm_agent import LlmAgent
 
@@ -14,70 +15,72 @@ load_dotenv()
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Cards are assembled from literals in this module and skills passed by main(), never from request data,
+# so they are built with model_construct() and skip pydantic validation.
+CAPABILITIES = AgentCapabilities.model_construct(streaming=True)
 
-class AgentBuilder:
-    _server: A2AServer
-    _agent_card: AgentCard
+# Hoisted to a module constant and dedented once at import, so the prompt no longer carries the indentation of main().
+QA_INSTRUCTION = textwrap.dedent("""
+    You are an agent who assists with Quality Assurance (QA) for software developed within GitVerse.
+
+    When you receive a QA request, you should first gather all necessary information:
+      1. The functionality or feature that needs testing.
+      2. Detailed descriptions of user flows, critical code sections, or functional requirements.
+      3. Potential edge cases or error scenarios that should be verified.
+
+    If any required information is missing, ask for clarification to ensure complete test coverage.
 
-    _host: int
-    _port: int
+    Once you have all the necessary details, you should:
+      - Generate a draft test plan or set of test cases using the generate_tests() tool.
+      - Execute tests against the target functionality by calling run_tests().
+      - Provide feedback and recommendations by calling return_feedback() with the test results and observations.
 
-    _llm_agent: LlmAgent
-    _skills: list[AgentSkill]
+    In your response, include a summary of the QA process, the outcomes from the tests, and any identified issues or improvement suggestions.
+""").strip()
+
+
+@dataclass(frozen=True, slots=True)
+class AgentBuilder:
+    host: str
+    port: int
+    llm_agent: LlmAgent
+    skills: list[AgentSkill]
 
-    def __init__(self, host: int, port: int):
+    def __post_init__(self):
         try:
             if not os.getenv("GOOGLE_API_KEY"):
                 raise MissingAPIKeyError("GOOGLE_API_KEY environment variable not set.")
-
-            self._host = host
-            self._port = port
         except MissingAPIKeyError as e:
             logger.error(f"Error: {e}")
             exit(1)
-        except Exception as e:
-            logger.error(f"An error occurred during server startup: {e}")
-            exit(1)
-
-    def set_llm_agent(self, llm_agent: LlmAgent):
-        self._llm_agent = llm_agent
-
-    def set_skills(self, skills: list[AgentSkill]):
-        self._skills = skills
 
     def build(self, name: str, description: str) -> A2AServer:
         try:
-            capabilities = AgentCapabilities(streaming=True)
-            self._agent_card = AgentCard(
+            agent_card = AgentCard.model_construct(
                 name=name,
                 description=description,
-                url=f"http://{self._host}:{self._port}/",
+                url=f"http://{self.host}:{self.port}/",
                 version="1.0.0",
                 defaultInputModes=AgentBuilderTemplate.SUPPORTED_CONTENT_TYPES,
                 defaultOutputModes=AgentBuilderTemplate.SUPPORTED_CONTENT_TYPES,
-                capabilities=capabilities,
-                skills=self._skills,
+                capabilities=CAPABILITIES,
+                skills=self.skills,
             )
 
-            self._server = A2AServer(
-                agent_card=self._agent_card,
+            server = A2AServer(
+                agent_card=agent_card,
                 task_manager=AgentTaskManager(
                     agent=AgentBuilderTemplate(
-                        llm_agent=self._llm_agent
+                        llm_agent=self.llm_agent
                     )
                 ),
-                host=self._host,
-                port=self._port,
+                host=self.host,
+                port=self.port,
             )
 
-            # Add CORSMiddleware to allow requests from any origin (disables CORS restrictions)
-            self._server.app.add_middleware(
-                CORSMiddleware,
-                allow_origins=["*"],  # Allow all origins
-                allow_methods=["*"],  # Allow all HTTP methods (GET, POST, etc.)
-                allow_headers=["*"],  # Allow all headers
-            )
-            return self._server
+            # Allow requests from any origin (disables CORS restrictions)
+            server.app.add_middleware(PermissiveCORSMiddleware)
+            return server
         except Exception as e:
             logger.error(f"An error occurred during server startup: {e}")
             exit(1)
@@ -87,8 +90,6 @@ class AgentBuilder:
 @click.option("--host", default="localhost")
 @click.option("--port", default=10005)
 def main(host, port):
-    builder = AgentBuilder(host, port)
-
     llm_agent = LlmAgent(
         model="gemini-2.0-flash-001",
         name="qa_agent",
@@ -96,42 +97,34 @@ def main(host, port):
             "This agent assists with quality assurance tasks, including test case generation, test execution, "
             "and delivering actionable feedback on software functionality and performance."
         ),
-        instruction="""
-          You are an agent who assists with Quality Assurance (QA) for software developed within GitVerse.
-
-          When you receive a QA request, you should first gather all necessary information:
-            1. The functionality or feature that needs testing.
-            2. Detailed descriptions of user flows, critical code sections, or functional requirements.
-            3. Potential edge cases or error scenarios that should be verified.
-
-          If any required information is missing, ask for clarification to ensure complete test coverage.
-
-          Once you have all the necessary details, you should:
-            - Generate a draft test plan or set of test cases using the generate_tests() tool.
-            - Execute tests against the target functionality by calling run_tests().
-            - Provide feedback and recommendations by calling return_feedback() with the test results and observations.
-
-          In your response, include a summary of the QA process, the outcomes from the tests, and any identified issues or improvement suggestions.
-              """,
-        tools=[],
+        instruction=QA_INSTRUCTION,
+        tools=[
+            generate_tests,
+            run_tests,
+            return_feedback,
+        ],
     )
 
-    builder.set_llm_agent(llm_agent=llm_agent)
-    builder.set_skills(skills=[
-        AgentSkill(
-            id="qa_assistance",
-            name="QA Assistant Tool",
-            description=(
-                "Assists with quality assurance tasks including generating test cases, "
-                "executing tests, and providing actionable feedback on software functionalities."
-            ),
-            tags=["qa", "quality_assurance", "testing", "feedback"],
-            examples=[
-                "Generate test cases for my login functionality.",
-                "Run tests on the checkout process and provide feedback.",
-            ],
-        )
-    ])
+    builder = AgentBuilder(
+        host=host,
+        port=port,
+        llm_agent=llm_agent,
+        skills=[
+            AgentSkill(
+                id="qa_assistance",
+                name="QA Assistant Tool",
+                description=(
+                    "Assists with quality assurance tasks including generating test cases, "
+                    "executing tests, and providing actionable feedback on software functionalities."
+                ),
+                tags=["qa", "quality_assurance", "testing", "feedback"],
+                examples=[
+                    "Generate test cases for my login functionality.",
+                    "Run tests on the checkout process and provide feedback.",
+                ],
+            )
+        ],
+    )
 
     server = builder.build(
         name="QA Agent",
@@ -1,11 +1,7 @@
-from common.server import A2AServer
 from common.types import AgentCard, AgentCapabilities, AgentSkill, MissingAPIKeyError
-from task_manager import AgentTaskManager
-from agent import CoordinatorAgent
 import click
 import os
 import logging
-from starlette.middleware.cors import CORSMiddleware
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -13,16 +9,22 @@ load_dotenv()
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+CAPABILITIES = AgentCapabilities(streaming=True)
+
 
 @click.command()
 @click.option("--host", default="localhost")
 @click.option("--port", default=10006)
 def main(host, port):
+    # Imported here so that --help and liveness probes don't pay for loading ADK, genai and Starlette.
+    from agent import CoordinatorAgent
+    from common.server import A2AServer, PermissiveCORSMiddleware
+    from task_manager import AgentTaskManager
+
     try:
         if not os.getenv("GOOGLE_API_KEY"):
             raise MissingAPIKeyError("GOOGLE_API_KEY environment variable not set.")
 
-        capabilities = AgentCapabilities(streaming=True)
         agent_card = AgentCard(
             name="CoordinatorAgent",
             description="This agent made by GitVerse to coordinate agent across PDLC cycle.",
@@ -30,7 +32,7 @@ def main(host, port):
             version="1.0.0",
             defaultInputModes=CoordinatorAgent.SUPPORTED_CONTENT_TYPES,
             defaultOutputModes=CoordinatorAgent.SUPPORTED_CONTENT_TYPES,
-            capabilities=capabilities,
+            capabilities=CAPABILITIES,
             skills=[],
         )
 
@@ -41,13 +43,8 @@ def main(host, port):
             port=port,
         )
 
-        # Add CORSMiddleware to allow requests from any origin (disables CORS restrictions)
-        server.app.add_middleware(
-            CORSMiddleware,
-            allow_origins=["*"],  # Allow all origins
-            allow_methods=["*"],  # Allow all HTTP methods (GET, POST, etc.)
-            allow_headers=["*"],  # Allow all headers
-        )
+        # Allow requests from any origin (disables CORS restrictions)
+        server.app.add_middleware(PermissiveCORSMiddleware)
 
         server.start()
     except MissingAPIKeyError as e:
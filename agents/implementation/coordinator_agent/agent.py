@@ -1,15 +1,17 @@
-import json
-import random
-from typing import Any, AsyncIterable, Dict, Optional
+import asyncio
+import contextlib
+import textwrap
+from typing import Any, AsyncIterable, Dict, Final, Optional
+from uuid import uuid4
 from google.adk.agents.llm_agent import LlmAgent
-from google.adk.tools.tool_context import ToolContext
 from google.adk.artifacts import InMemoryArtifactService
 from google.adk.memory.in_memory_memory_service import InMemoryMemoryService
 from google.adk.runners import Runner
-from google.adk.sessions import InMemorySessionService
-from google.genai import types
 
-from implementation.sde_agent.agent import SDEAgent
+from common.utils.adk import build_session_service, construct_user_content
+from common.utils.event_batching import batch_events
+
+from implementation.sde_agent.agent import SDEAgent, default_agent as default_sde_agent
 
 from implementation.qa_agent.agent import QAAgent
 
@@ -20,19 +22,46 @@ request_ids = set()
 task_ids = set()
 
 
+async def _final_response(agent: SDEAgent | QAAgent, query: str) -> Any:
+    """Runs a query on a throwaway session of a sub-agent and returns its final response."""
+    session_id = uuid4().hex
+    try:
+        # aclosing() shuts the stream down as soon as the final response is read.
+        async with contextlib.aclosing(agent.stream(query, session_id)) as items:
+            async for item in items:
+                if item["is_task_complete"]:
+                    return item["content"]
+        return ""
+    finally:
+        agent.delete_session(session_id)
+
+
+_COORDINATOR_INSTRUCTION: Final = textwrap.dedent("""
+    You coordinate the agents of the product development lifecycle (PDLC) made by GitVerse.
+
+    Delegate software development tasks to sde_agent and quality assurance tasks to qa_agent.
+
+    When a request needs both an implementation and tests for the same feature, and the two do not depend
+    on each other's output, call run_parallel() with a self-contained request for each agent instead of
+    delegating to them one after the other. Summarize both results in your response.
+""").strip()
+
+
 class CoordinatorAgent:
     """An agent that handles reimbursement requests."""
 
     SUPPORTED_CONTENT_TYPES = ["text", "text/plain"]
 
     def __init__(self):
+        # Standalone QA agent used by run_parallel(), created on first use.
+        self._qa_agent: Optional[QAAgent] = None
         self._agent = self._build_agent()
         self._user_id = "remote_agent"
         self._runner = Runner(
             app_name=self._agent.name,
             agent=self._agent,
             artifact_service=InMemoryArtifactService(),
-            session_service=InMemorySessionService(),
+            session_service=build_session_service(),
             memory_service=InMemoryMemoryService(),
         )
 
@@ -40,9 +69,7 @@ class CoordinatorAgent:
         session = self._runner.session_service.get_session(
             app_name=self._agent.name, user_id=self._user_id, session_id=session_id
         )
-        content = types.Content(
-            role="user", parts=[types.Part.from_text(text=query)]
-        )
+        content = construct_user_content(query)
 
         if session is None:
             session = self._runner.session_service.create_session(
@@ -51,20 +78,21 @@ class CoordinatorAgent:
                 state={},
                 session_id=session_id,
             )
-        events = list(self._runner.run(
-            user_id=self._user_id, session_id=session.id, new_message=content
-        ))
-        if not events or not events[-1].content or not events[-1].content.parts:
+        # Only the last event is needed; intermediate tool and partial events are dropped as they arrive.
+        last_event = None
+        for event in self._runner.run(
+                user_id=self._user_id, session_id=session.id, new_message=content
+        ):
+            last_event = event
+        if last_event is None or not last_event.content or not last_event.content.parts:
             return ""
-        return "\n".join([p.text for p in events[-1].content.parts if p.text])
+        return "\n".join([p.text for p in last_event.content.parts if p.text])
 
     async def stream(self, query, session_id) -> AsyncIterable[Dict[str, Any]]:
         session = self._runner.session_service.get_session(
             app_name=self._agent.name, user_id=self._user_id, session_id=session_id
         )
-        content = types.Content(
-            role="user", parts=[types.Part.from_text(text=query)]
-        )
+        content = construct_user_content(query)
         if session is None:
             session = self._runner.session_service.create_session(
                 app_name=self._agent.name,
@@ -72,22 +100,22 @@ class CoordinatorAgent:
                 state={},
                 session_id=session_id,
             )
-        async for event in self._runner.run_async(
-                user_id=self._user_id, session_id=session.id, new_message=content
+        async for batch in batch_events(
+                self._runner.run_async(
+                    user_id=self._user_id, session_id=session.id, new_message=content
+                ),
+                is_final=lambda e: e.is_final_response(),
         ):
+            # Intermediate events carry no payload, so a batch is reported as a single update.
+            event = batch[-1]
             if event.is_final_response():
-                response = ""
-                if (
-                        event.content
-                        and event.content.parts
-                        and event.content.parts[0].text
-                ):
-                    response = "\n".join([p.text for p in event.content.parts if p.text])
-                elif (
-                        event.content
-                        and event.content.parts
-                        and any([True for p in event.content.parts if p.function_response])):
-                    response = next((p.function_response.model_dump() for p in event.content.parts))
+                parts = event.content.parts if event.content and event.content.parts else ()
+                texts = [p.text for p in parts if p.text]
+                if texts:
+                    response = "\n".join(texts)
+                else:
+                    function_response = next((p.function_response for p in parts if p.function_response), None)
+                    response = function_response.model_dump() if function_response else ""
                 yield {
                     "is_task_complete": True,
                     "content": response,
@@ -98,16 +126,45 @@ class CoordinatorAgent:
                     "updates": "Processing the SDE request...",
                 }
 
+    async def run_parallel(self, sde_request: str, qa_request: str) -> dict[str, Any]:
+        """
+        Run a software development request and a quality assurance request at the same time.
+
+        Args:
+            sde_request (str): A self-contained development request for the SDE agent, including language,
+                requirements and constraints.
+            qa_request (str): A self-contained QA request for the QA agent, including the feature under test,
+                test requirements and constraints.
+
+        Returns:
+            dict[str, Any]: A dictionary containing the SDE agent's final solution and the QA agent's final report.
+        """
+        if self._qa_agent is None:
+            self._qa_agent = QAAgent()
+        solution, qa_report = await asyncio.gather(
+            _final_response(default_sde_agent(), sde_request),
+            _final_response(self._qa_agent, qa_request),
+        )
+        return {
+            "solution": solution,
+            "qa_report": qa_report,
+        }
+
     def _build_agent(self) -> LlmAgent:
         """Builds the LLM agent for the PDLC agents coordination."""
 
-        sde_agent = SDEAgent()._build_agent()
-        qa_agent = QAAgent()._build_agent()
+        # Only the LLM agents are needed here; instantiating SDEAgent/QAAgent would also build their runners.
+        sde_agent = SDEAgent._build_agent()
+        qa_agent = QAAgent._build_agent()
 
         coordinator = LlmAgent(
             name="Coordinator",
             model="gemini-2.0-flash",
             description="I'm coordinating PDLC agents to automate processes.",
+            instruction=_COORDINATOR_INSTRUCTION,
+            tools=[
+                self.run_parallel,
+            ],
             sub_agents=[  # Assign sub_agents here
                 sde_agent,
                 qa_agent
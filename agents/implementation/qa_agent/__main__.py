@@ -1,11 +1,7 @@
-from common.server import A2AServer
 from common.types import AgentCard, AgentCapabilities, AgentSkill, MissingAPIKeyError
-from task_manager import AgentTaskManager
-from agent import QAAgent
 import click
 import os
 import logging
-from starlette.middleware.cors import CORSMiddleware  # Import CORSMiddleware
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -13,29 +9,35 @@ load_dotenv()
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+CAPABILITIES = AgentCapabilities(streaming=True)
+SKILL = AgentSkill(
+    id="qa_assistance",
+    name="QA Assistant Tool",
+    description=(
+        "Assists with quality assurance tasks including generating test cases, "
+        "executing tests, and providing actionable feedback on software functionalities."
+    ),
+    tags=["qa", "quality_assurance", "testing", "feedback"],
+    examples=[
+        "Generate test cases for my login functionality.",
+        "Run tests on the checkout process and provide feedback.",
+    ],
+)
+
 
 @click.command()
 @click.option("--host", default="localhost")
 @click.option("--port", default=10005)
 def main(host, port):
+    # Imported here so that --help and liveness probes don't pay for loading ADK, genai and Starlette.
+    from agent import QAAgent
+    from common.server import A2AServer, PermissiveCORSMiddleware
+    from task_manager import AgentTaskManager
+
     try:
         if not os.getenv("GOOGLE_API_KEY"):
             raise MissingAPIKeyError("GOOGLE_API_KEY environment variable not set.")
 
-        capabilities = AgentCapabilities(streaming=True)
-        skill = AgentSkill(
-            id="qa_assistance",
-            name="QA Assistant Tool",
-            description=(
-                "Assists with quality assurance tasks including generating test cases, "
-                "executing tests, and providing actionable feedback on software functionalities."
-            ),
-            tags=["qa", "quality_assurance", "testing", "feedback"],
-            examples=[
-                "Generate test cases for my login functionality.",
-                "Run tests on the checkout process and provide feedback.",
-            ],
-        )
         agent_card = AgentCard(
             name="QA Agent",
             description=(
@@ -46,8 +48,8 @@ def main(host, port):
             version="1.0.0",
             defaultInputModes=QAAgent.SUPPORTED_CONTENT_TYPES,
             defaultOutputModes=QAAgent.SUPPORTED_CONTENT_TYPES,
-            capabilities=capabilities,
-            skills=[skill],
+            capabilities=CAPABILITIES,
+            skills=[SKILL],
         )
         server = A2AServer(
             agent_card=agent_card,
@@ -55,13 +57,8 @@ def main(host, port):
             host=host,
             port=port,
         )
-        # Add CORSMiddleware to allow requests from any origin (disables CORS restrictions)
-        server.app.add_middleware(
-            CORSMiddleware,
-            allow_origins=["*"],  # Allow all origins
-            allow_methods=["*"],  # Allow all HTTP methods (GET, POST, etc.)
-            allow_headers=["*"],  # Allow all headers
-        )
+        # Allow requests from any origin (disables CORS restrictions)
+        server.app.add_middleware(PermissiveCORSMiddleware)
         server.start()
     except MissingAPIKeyError as e:
         logger.error(f"Error: {e}")
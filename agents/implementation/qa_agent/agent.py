@@ -1,14 +1,23 @@
 import json
 import random
-from typing import Any, AsyncIterable, Dict, Optional
+import textwrap
+from typing import Any, AsyncIterable, Dict, Final, Optional
 from google.adk.agents.llm_agent import LlmAgent
-from google.adk.tools.tool_context import ToolContext
 from google.adk.artifacts import InMemoryArtifactService
 from google.adk.memory.in_memory_memory_service import InMemoryMemoryService
 from google.adk.runners import Runner
 from google.adk.sessions import InMemorySessionService
 from google.genai import types
 
+__all__ = [
+    "generate_tests",
+    "run_tests",
+    "return_feedback",
+    "run_sde_tests",
+    "return_solution",
+    "QAAgent",
+]
+
 # Local cache of created request_ids for demo purposes.
 task_ids = set()
 
@@ -99,7 +108,7 @@ def return_feedback(qa_details: dict[str, Any],
     return feedback_report
 
 
-def run_tests(task_id: str, code: str) -> dict[str, Any]:
+def run_sde_tests(task_id: str, code: str) -> dict[str, Any]:
     """
     Execute tests for the generated code corresponding to the given task_id.
 
@@ -149,6 +158,25 @@ def return_solution(task_details: dict[str, Any], code_info: dict[str, Any], tes
     return solution
 
 
+_QA_INSTRUCTION: Final = textwrap.dedent("""
+    You are an agent who assists with Quality Assurance (QA) for software developed within GitVerse.
+
+    When you receive a QA request, you should first gather all necessary information:
+      1. The functionality or feature that needs testing.
+      2. Detailed descriptions of user flows, critical code sections, or functional requirements.
+      3. Potential edge cases or error scenarios that should be verified.
+
+    If any required information is missing, ask for clarification to ensure complete test coverage.
+
+    Once you have all the necessary details, you should:
+      - Generate a draft test plan or set of test cases using the generate_tests() tool.
+      - Execute tests against the target functionality by calling run_tests().
+      - Provide feedback and recommendations by calling return_feedback() with the test results and observations.
+
+    In your response, include a summary of the QA process, the outcomes from the tests, and any identified issues or improvement suggestions.
+""").strip()
+
+
 class QAAgent:
     """An agent that handles reimbursement requests."""
 
@@ -186,6 +214,12 @@ class QAAgent:
             return ""
         return "\n".join([p.text for p in events[-1].content.parts if p.text])
 
+    def delete_session(self, session_id) -> None:
+        """Drops the session for session_id and its history."""
+        self._runner.session_service.delete_session(
+            app_name=self._agent.name, user_id=self._user_id, session_id=session_id
+        )
+
     async def stream(self, query, session_id) -> AsyncIterable[Dict[str, Any]]:
         session = self._runner.session_service.get_session(
             app_name=self._agent.name, user_id=self._user_id, session_id=session_id
@@ -226,7 +260,8 @@ class QAAgent:
                     "updates": "Processing the QA request...",
                 }
 
-    def _build_agent(self) -> LlmAgent:
+    @staticmethod
+    def _build_agent() -> LlmAgent:
         """Builds the LLM agent for Quality Assurance (QA) tasks."""
         return LlmAgent(
             model="gemini-2.0-flash-001",
@@ -235,23 +270,7 @@ class QAAgent:
                 "This agent assists with quality assurance tasks, including test case generation, test execution, "
                 "and delivering actionable feedback on software functionality and performance."
             ),
-            instruction="""
-      You are an agent who assists with Quality Assurance (QA) for software developed within GitVerse.
-
-      When you receive a QA request, you should first gather all necessary information:
-        1. The functionality or feature that needs testing.
-        2. Detailed descriptions of user flows, critical code sections, or functional requirements.
-        3. Potential edge cases or error scenarios that should be verified.
-
-      If any required information is missing, ask for clarification to ensure complete test coverage.
-
-      Once you have all the necessary details, you should:
-        - Generate a draft test plan or set of test cases using the generate_tests() tool.
-        - Execute tests against the target functionality by calling run_tests().
-        - Provide feedback and recommendations by calling return_feedback() with the test results and observations.
-
-      In your response, include a summary of the QA process, the outcomes from the tests, and any identified issues or improvement suggestions.
-          """,
+            instruction=_QA_INSTRUCTION,
             tools=[
                 generate_tests,
                 run_tests,
@@ -1,22 +1,39 @@
-import json
-import random
-from typing import Any, AsyncIterable, Dict, Optional
+import asyncio
+import contextlib
+import functools
+import itertools
+import os
+import textwrap
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from types import MappingProxyType
+from typing import Any, AsyncGenerator, AsyncIterable, Final, Iterable, Mapping, Optional
 from google.adk.agents.llm_agent import LlmAgent
-from google.adk.tools.tool_context import ToolContext
 from google.adk.artifacts import InMemoryArtifactService
 from google.adk.memory.in_memory_memory_service import InMemoryMemoryService
 from google.adk.runners import Runner
-from google.adk.sessions import InMemorySessionService
-from google.genai import types
+from google.adk.sessions import InMemorySessionService, Session
 
-# Local cache of created request_ids for demo purposes.
-request_ids = set()
+from common.utils.adk import construct_user_content
+from common.utils.event_batching import batch_events
+from common.utils.lru_cache import MISSING, LRUCache, cache_key
 
-# A set to track task_ids for demonstration purposes.
-task_ids = set()
+# Tracks task_ids for demonstration purposes; the oldest ones are evicted so the registry stays bounded.
+task_ids = LRUCache(maxsize=10_000)
 
+# Source of task_ids; itertools.count is atomic under the GIL, so no lock is needed.
+_task_counter = itertools.count(1)
 
-def generate_code(task_details: dict[str, Any]) -> dict[str, Any]:
+# Set SDE_SOLUTION_AS_JSON=true to have SDEAgent.stream() deliver the return_solution() result as a JSON
+# string, tagged with mime_type "application/json", instead of the function response dict.
+SOLUTION_AS_JSON = os.getenv("SDE_SOLUTION_AS_JSON", "").lower() in ("1", "true", "yes")
+
+# Generated code keyed by the normalized task spec it was built from.
+generated_code_cache = LRUCache(maxsize=1024, ttl=3600)
+
+
+async def generate_code(task_details: dict[str, Any]) -> dict[str, Any]:
     """
     Generate code based on the provided task details.
 
@@ -29,8 +46,25 @@ def generate_code(task_details: dict[str, Any]) -> dict[str, Any]:
     Returns:
         dict[str, Any]: A dictionary containing the generated code, a unique task_id, and the task details.
     """
-    task_id = "task_id_" + str(random.randint(1000000, 9999999))
-    task_ids.add(task_id)
+    spec_key = cache_key(
+        task_details.get('language'),
+        task_details.get('requirements'),
+        task_details.get('constraints'),
+    )
+    cached = generated_code_cache.get(spec_key)
+    if cached is not None:
+        # Reuse the original task_id so run_tests() keeps accepting it.
+        task_id, generated_code = cached
+        task_ids.set(task_id, True)
+        task_details['task_id'] = task_id
+        return {
+            "task_id": task_id,
+            "code": generated_code,
+            "task_details": task_details,
+        }
+
+    task_id = f"task_id_{next(_task_counter):08x}"
+    task_ids.set(task_id, True)
     task_details['task_id'] = task_id
 
     # The generated code is a placeholder and should be replaced by actual code generation logic.
@@ -43,6 +77,7 @@ def generate_code(task_details: dict[str, Any]) -> dict[str, Any]:
         "    # TODO: Implement the solution here\n"
         "    pass\n"
     )
+    generated_code_cache.set(spec_key, (task_id, generated_code))
     return {
         "task_id": task_id,
         "code": generated_code,
@@ -50,7 +85,7 @@ def generate_code(task_details: dict[str, Any]) -> dict[str, Any]:
     }
 
 
-def run_tests(task_id: str, code: str) -> dict[str, Any]:
+async def run_tests(task_id: str, code: str) -> dict[str, Any]:
     """
     Execute tests for the generated code corresponding to the given task_id.
 
@@ -62,7 +97,8 @@ def run_tests(task_id: str, code: str) -> dict[str, Any]:
         dict[str, Any]: A dictionary containing the status and results of the test execution.
     """
     # Verify the task_id exists.
-    if task_id not in task_ids:
+    # get() also refreshes the task's recency, so tasks still being tested are not evicted.
+    if task_ids.get(task_id, MISSING) is MISSING:
         return {"task_id": task_id, "status": "Error: Invalid task_id."}
 
     # In a real-world scenario, you would dynamically run tests against the code.
@@ -75,7 +111,7 @@ def run_tests(task_id: str, code: str) -> dict[str, Any]:
     }
 
 
-def return_solution(task_details: dict[str, Any], code_info: dict[str, Any], test_results: dict[str, Any]) -> dict[
+async def return_solution(task_details: dict[str, Any], code_info: dict[str, Any], test_results: dict[str, Any]) -> dict[
     str, Any]:
     """
     Return a final structured JSON object that represents the completed SDE solution.
@@ -95,16 +131,112 @@ def return_solution(task_details: dict[str, Any], code_info: dict[str, Any], tes
         "test_status": test_results.get("status", ""),
         "task_details": task_details,
     }
-    # Optionally, to return a JSON string, uncomment the next line:
-    # return json.dumps(solution)
     return solution
 
 
+def _to_json(value: Any) -> str:
+    """Serializes value to a JSON string with orjson."""
+    # Imported here so the default dict path doesn't load orjson.
+    import orjson
+
+    return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
+_SDE_DESCRIPTION: Final = (
+    "This agent assists with various software development tasks, including code generation, debugging, "
+    "and solution validation."
+)
+
+_SDE_INSTRUCTION: Final = textwrap.dedent("""
+    You are an agent who assists the Software Development Engineer (SDE) with development tasks made by GitVerse.
+
+    When you receive a software development request, you should first gather all necessary information:
+      1. The programming language and frameworks involved.
+      2. A detailed description of the task, such as feature implementation, bug fixes, or code refactoring.
+      3. Any specific requirements, constraints, or deadlines.
+
+    If the task request is incomplete, ask for any missing details to ensure clarity.
+
+    Once you have all the required information, you should:
+      - Generate a draft solution using the generate_code() tool.
+      - Validate the solution by executing tests with run_tests().
+      - Finalize your response by calling return_solution() with the task details and testing outcome.
+
+    In your response, include a summary of the task details and the final status, indicating any improvements or modifications you applied.
+""").strip()
+
+# How many events SDEAgent.stream() lets the runner produce ahead of the client.
+_EVENT_QUEUE_SIZE: Final = 8
+
+# Marks the end of the runner's events in the stream() queue.
+_END_OF_STREAM: Final = object()
+
+# Progress update shared by every stream(); read-only, so it can be yielded without copying.
+_PROCESSING_UPDATE: Final = MappingProxyType({
+    "is_task_complete": False,
+    "updates": "Processing the SDE request...",
+})
+
+_TOOLS: Final = [
+    generate_code,
+    run_tests,
+    return_solution,
+]
+
+
+class BoundedSessionService(InMemorySessionService):
+    """An InMemorySessionService that keeps at most max_sessions sessions.
+
+    Once the limit is reached, creating a session deletes the least recently fetched one,
+    so a long-running server does not accumulate every conversation it has ever seen.
+
+    Written against google-adk 0.0.3 (pinned in uv.lock): it relies on that version's synchronous
+    session methods and on its storage layout, ``self.sessions[app_name][user_id][session_id]``.
+    Re-check eviction when upgrading ADK.
+    """
+
+    def __init__(self, max_sessions: int = 10_000):
+        if max_sessions <= 0:
+            raise ValueError("max_sessions must be positive")
+        super().__init__()
+        self._max_sessions = max_sessions
+        # (app_name, user_id, session_id) of live sessions, least recently used first.
+        self._recency: OrderedDict[tuple[str, str, str], None] = OrderedDict()
+        self._recency_lock = threading.Lock()
+
+    def create_session(self, *, app_name: str, user_id: str, **kwargs) -> Session:
+        session = super().create_session(app_name=app_name, user_id=user_id, **kwargs)
+        with self._recency_lock:
+            self._recency[(app_name, user_id, session.id)] = None
+            while len(self._recency) > self._max_sessions:
+                app, user, session_id = self._recency.popitem(last=False)[0]
+                # Dropped from the store directly: the parent's delete_session() first fetches,
+                # and so deep-copies, the whole session just to check that it exists.
+                self.sessions.get(app, {}).get(user, {}).pop(session_id, None)
+        return session
+
+    def get_session(self, *, app_name: str, user_id: str, session_id: str, **kwargs) -> Optional[Session]:
+        session = super().get_session(app_name=app_name, user_id=user_id, session_id=session_id, **kwargs)
+        if session is not None:
+            with self._recency_lock:
+                key = (app_name, user_id, session_id)
+                if key in self._recency:
+                    self._recency.move_to_end(key)
+        return session
+
+    def delete_session(self, *, app_name: str, user_id: str, session_id: str, **kwargs) -> None:
+        with self._recency_lock:
+            self._recency.pop((app_name, user_id, session_id), None)
+        super().delete_session(app_name=app_name, user_id=user_id, session_id=session_id, **kwargs)
+
+
 class SDEAgent:
     """An agent that handles reimbursement requests."""
 
     SUPPORTED_CONTENT_TYPES = ["text", "text/plain"]
 
+    __slots__ = ("_agent", "_user_id", "_runner", "_session_kwargs")
+
     def __init__(self):
         self._agent = self._build_agent()
         self._user_id = "remote_agent"
@@ -112,25 +244,28 @@ class SDEAgent:
             app_name=self._agent.name,
             agent=self._agent,
             artifact_service=InMemoryArtifactService(),
-            session_service=InMemorySessionService(),
+            session_service=BoundedSessionService(max_sessions=10_000),
             memory_service=InMemoryMemoryService(),
         )
+        # The part of every session lookup that never changes for this agent.
+        self._session_kwargs = MappingProxyType({"app_name": self._agent.name, "user_id": self._user_id})
 
-    def invoke(self, query, session_id) -> str:
-        session = self._runner.session_service.get_session(
-            app_name=self._agent.name, user_id=self._user_id, session_id=session_id
-        )
-        content = types.Content(
-            role="user", parts=[types.Part.from_text(text=query)]
+    def _get_or_create_session(self, session_id):
+        """Returns the session for session_id, creating an empty one on first use."""
+        session_service = self._runner.session_service
+        return session_service.get_session(
+            **self._session_kwargs, session_id=session_id
+        ) or session_service.create_session(
+            **self._session_kwargs, state={}, session_id=session_id
         )
 
-        if session is None:
-            session = self._runner.session_service.create_session(
-                app_name=self._agent.name,
-                user_id=self._user_id,
-                state={},
-                session_id=session_id,
-            )
+    def delete_session(self, session_id) -> None:
+        """Drops the session for session_id and its history."""
+        self._runner.session_service.delete_session(**self._session_kwargs, session_id=session_id)
+
+    def invoke(self, query, session_id) -> str:
+        session = self._get_or_create_session(session_id)
+        content = construct_user_content(query)
         events = list(self._runner.run(
             user_id=self._user_id, session_id=session.id, new_message=content
         ))
@@ -138,75 +273,108 @@ class SDEAgent:
             return ""
         return "\n".join([p.text for p in events[-1].content.parts if p.text])
 
-    async def stream(self, query, session_id) -> AsyncIterable[Dict[str, Any]]:
-        session = self._runner.session_service.get_session(
-            app_name=self._agent.name, user_id=self._user_id, session_id=session_id
-        )
-        content = types.Content(
-            role="user", parts=[types.Part.from_text(text=query)]
-        )
-        if session is None:
-            session = self._runner.session_service.create_session(
-                app_name=self._agent.name,
-                user_id=self._user_id,
-                state={},
-                session_id=session_id,
-            )
-        async for event in self._runner.run_async(
+    async def stream(self, query, session_id) -> AsyncIterable[Mapping[str, Any]]:
+        session = self._get_or_create_session(session_id)
+        content = construct_user_content(query)
+        # The runner is drained by its own task so the model keeps working while the client
+        # reads; the bounded queue stops it from running too far ahead of a slow client.
+        queue: asyncio.Queue = asyncio.Queue(maxsize=_EVENT_QUEUE_SIZE)
+        producer = asyncio.create_task(self._drain_events(
+            self._runner.run_async(
                 user_id=self._user_id, session_id=session.id, new_message=content
-        ):
-            if event.is_final_response():
-                response = ""
-                if (
-                        event.content
-                        and event.content.parts
-                        and event.content.parts[0].text
-                ):
-                    response = "\n".join([p.text for p in event.content.parts if p.text])
-                elif (
-                        event.content
-                        and event.content.parts
-                        and any([True for p in event.content.parts if p.function_response])):
-                    response = next((p.function_response.model_dump() for p in event.content.parts))
-                yield {
-                    "is_task_complete": True,
-                    "content": response,
-                }
-            else:
-                yield {
-                    "is_task_complete": False,
-                    "updates": "Processing the SDE request...",
-                }
-
-    def _build_agent(self) -> LlmAgent:
+            ),
+            queue,
+        ))
+        try:
+            async for batch in batch_events(
+                    self._dequeue_events(queue),
+                    is_final=lambda e: e.is_final_response(),
+            ):
+                # Intermediate events carry no payload, so a batch is reported as a single update.
+                event = batch[-1]
+                if event.is_final_response():
+                    # Classify the parts in one pass: text wins, else the first function response.
+                    texts, function_response = [], None
+                    for p in (event.content.parts if event.content else None) or ():
+                        if p.text:
+                            texts.append(p.text)
+                        elif function_response is None and p.function_response:
+                            function_response = p.function_response
+                    result = {"is_task_complete": True, "content": ""}
+                    if texts:
+                        result["content"] = "\n".join(texts)
+                    elif function_response:
+                        if SOLUTION_AS_JSON and function_response.name == return_solution.__name__:
+                            # Just the solution, without the function response wrapper.
+                            result["content"] = _to_json(function_response.response)
+                            result["mime_type"] = "application/json"
+                        else:
+                            result["content"] = function_response.model_dump()
+                    yield result
+                else:
+                    yield _PROCESSING_UPDATE
+        finally:
+            # Wait for the producer, so the runner's generator is closed before the stream ends.
+            producer.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await producer
+
+    def invoke_batch(self, items: Iterable[tuple[str, str]], max_workers: int = 10) -> list[str]:
+        """Runs invoke() for each (query, session_id) pair on a thread pool.
+
+        Results are returned in the order of items. Each item should use its own session_id;
+        requests sharing a session would race on its history.
+        """
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(lambda item: self.invoke(*item), items))
+
+    async def ainvoke_batch(self, items: Iterable[tuple[str, str]], max_workers: int = 10) -> list[str]:
+        """Async counterpart of invoke_batch(), running at most max_workers invocations at a time."""
+        semaphore = asyncio.Semaphore(max_workers)
+
+        async def invoke(query: str, session_id: str) -> str:
+            async with semaphore:
+                return await asyncio.to_thread(self.invoke, query, session_id)
+
+        return list(await asyncio.gather(*(invoke(*item) for item in items)))
+
+    @staticmethod
+    async def _drain_events(events: AsyncGenerator[Any, None], queue: asyncio.Queue) -> None:
+        """Copies events into queue, then puts _END_OF_STREAM, or the exception that ended them."""
+        try:
+            # aclosing() runs the runner's cleanup in this task when it is cancelled mid-stream.
+            async with contextlib.aclosing(events):
+                async for event in events:
+                    await queue.put(event)
+        except Exception as e:
+            await queue.put(e)
+        else:
+            await queue.put(_END_OF_STREAM)
+
+    @staticmethod
+    async def _dequeue_events(queue: asyncio.Queue) -> AsyncIterable[Any]:
+        """Yields the events put by _drain_events(), re-raising the runner's exception if it failed."""
+        while (event := await queue.get()) is not _END_OF_STREAM:
+            if isinstance(event, Exception):
+                raise event
+            yield event
+
+    @staticmethod
+    def _build_agent() -> LlmAgent:
         """Builds the LLM agent for the Software Development Engineer (SDE) tasks."""
         return LlmAgent(
             model="gemini-2.0-flash-001",
             name="sde_agent",
-            description=(
-                "This agent assists with various software development tasks, including code generation, debugging, "
-                "and solution validation."
-            ),
-            instruction="""
-      You are an agent who assists the Software Development Engineer (SDE) with development tasks made by GitVerse.
-
-      When you receive a software development request, you should first gather all necessary information:
-        1. The programming language and frameworks involved.
-        2. A detailed description of the task, such as feature implementation, bug fixes, or code refactoring.
-        3. Any specific requirements, constraints, or deadlines.
-
-      If the task request is incomplete, ask for any missing details to ensure clarity.
-
-      Once you have all the required information, you should:
-        - Generate a draft solution using the generate_code() tool.
-        - Validate the solution by executing tests with run_tests().
-        - Finalize your response by calling return_solution() with the task details and testing outcome.
-
-      In your response, include a summary of the task details and the final status, indicating any improvements or modifications you applied.
-          """,
-            tools=[
-                generate_code,
-                run_tests,
-                return_solution,
-            ],
+            description=_SDE_DESCRIPTION,
+            instruction=_SDE_INSTRUCTION,
+            tools=_TOOLS,
         )
+
+
+@functools.cache
+def default_agent() -> SDEAgent:
+    """Returns the process-wide SDEAgent, built on first use.
+
+    Sharing one instance is safe: conversations are isolated by session_id in the runner's session service.
+    """
+    return SDEAgent()
@@ -45,7 +45,12 @@ class AgentTaskManager(InMemoryTaskManager):
                     task_state = TaskState.WORKING
                     parts = [{"type": "text", "text": item["updates"]}]
                 else:
-                    if isinstance(item["content"], dict):
+                    if item.get("mime_type") == "application/json":
+                        # A return_solution() result already encoded by the agent.
+                        task_state = TaskState.COMPLETED
+                        parts = [{"type": "text", "text": item["content"],
+                                  "metadata": {"mimeType": "application/json"}}]
+                    elif isinstance(item["content"], dict):
                         if ("response" in item["content"]
                                 and "result" in item["content"]["response"]):
                             data = json.loads(item["content"]["response"]["result"])
@@ -0,0 +1,39 @@
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse
+from starlette.testclient import TestClient
+from common.server import PermissiveCORSMiddleware
+
+
+def _client() -> TestClient:
+    app = Starlette()
+    app.add_route("/", lambda request: PlainTextResponse("ok"), methods=["GET", "POST"])
+    app.add_middleware(PermissiveCORSMiddleware)
+    return TestClient(app)
+
+
+def test_simple_request_allows_any_origin():
+    response = _client().post("/", headers={"Origin": "http://example.com"})
+    assert response.status_code == 200
+    assert response.text == "ok"
+    assert response.headers["access-control-allow-origin"] == "*"
+
+
+def test_preflight_is_answered_without_reaching_the_app():
+    response = _client().options(
+        "/",
+        headers={
+            "Origin": "http://example.com",
+            "Access-Control-Request-Method": "POST",
+            "Access-Control-Request-Headers": "content-type, authorization",
+        },
+    )
+    assert response.status_code == 204
+    assert response.headers["access-control-allow-origin"] == "*"
+    assert "POST" in response.headers["access-control-allow-methods"]
+    assert response.headers["access-control-allow-headers"] == "content-type, authorization"
+
+
+def test_plain_options_request_is_passed_through():
+    response = _client().options("/")
+    assert response.status_code == 405
+    assert response.headers["access-control-allow-origin"] == "*"
@@ -0,0 +1,20 @@
+"""Test cases for the ADK helper utilities"""
+from google.adk.sessions import InMemorySessionService
+from google.genai import types
+
+from common.utils.adk import build_session_service, construct_user_content
+
+
+def test_in_memory_session_service_by_default(monkeypatch):
+    """Without SESSION_DB_URL every process keeps its own sessions."""
+    monkeypatch.delenv("SESSION_DB_URL", raising=False)
+    assert isinstance(build_session_service(), InMemorySessionService)
+
+def test_constructed_user_content_is_not_shared():
+    """Every call builds its own message, so session histories never share one."""
+    assert construct_user_content("hello") is not construct_user_content("hello")
+
+def test_constructed_user_content_matches_validated():
+    """Skipping validation yields the same message as the validated constructors."""
+    expected = types.Content(role="user", parts=[types.Part.from_text(text="hello")])
+    assert construct_user_content("hello") == expected
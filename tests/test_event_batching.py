@@ -0,0 +1,69 @@
+"""Test cases for the batch_events utility"""
+import asyncio
+import time
+
+from common.utils.event_batching import batch_events
+
+
+async def _events(items, delay=0.0):
+    for item in items:
+        if delay:
+            await asyncio.sleep(delay)
+        yield item
+
+
+def _collect(events, **kwargs):
+    async def run():
+        return [batch async for batch in batch_events(events, lambda e: e == "final", **kwargs)]
+
+    return asyncio.run(run())
+
+
+def test_first_event_is_flushed_immediately():
+    """The first batch contains only the first event."""
+    batches = _collect(_events(["a", "b", "c"]), max_delay=10)
+    assert batches[0] == ["a"]
+
+def test_burst_is_coalesced():
+    """Events arriving within max_delay end up in one batch."""
+    batches = _collect(_events(["a", "b", "c", "d"]), max_delay=10)
+    assert batches == [["a"], ["b", "c", "d"]]
+
+def test_max_size_forces_flush():
+    """No batch grows beyond max_size."""
+    batches = _collect(_events([str(i) for i in range(7)]), max_size=3, max_delay=10)
+    assert batches == [["0"], ["1", "2", "3"], ["4", "5", "6"]]
+
+def test_final_event_flushes_pending_batch():
+    """A final event is delivered at once, at the end of its batch."""
+    batches = _collect(_events(["a", "b", "final", "c"]), max_delay=10)
+    assert batches == [["a"], ["b", "final"], ["c"]]
+
+def test_slow_events_are_not_delayed():
+    """Events spaced further apart than max_delay are flushed one by one."""
+    batches = _collect(_events(["a", "b", "c"], delay=0.02), max_delay=0.01)
+    assert batches == [["a"], ["b"], ["c"]]
+
+def test_held_event_waits_for_next_event():
+    """A held event is not flushed on a timer, only with the next event after a gap."""
+    async def events():
+        yield "a"
+        yield "b"
+        await asyncio.sleep(0.1)
+        yield "c"
+        yield "d"
+
+    async def run():
+        received = []
+        async for batch in batch_events(events(), lambda e: e == "final", max_delay=0.01):
+            received.append((batch, time.monotonic() - start))
+        return received
+
+    start = time.monotonic()
+    received = asyncio.run(run())
+    assert [batch for batch, _ in received] == [["a"], ["b", "c"], ["d"]]
+    assert received[1][1] >= 0.1
+
+def test_empty_stream():
+    """An empty stream yields no batches."""
+    assert _collect(_events([])) == []
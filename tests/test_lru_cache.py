@@ -0,0 +1,126 @@
+"""Test cases for the LRUCache utility"""
+import pytest
+import time
+import threading
+
+from common.utils.lru_cache import MISSING, LRUCache, cache_key
+
+# --- Fixtures ---
+
+@pytest.fixture(scope="function")
+def cache_instance():
+    """Provides a small LRUCache instance so eviction is easy to observe."""
+    return LRUCache(maxsize=3)
+
+
+# --- Test Cases ---
+
+def test_instances_are_independent():
+    """Unlike InMemoryCache, every LRUCache owns its own storage."""
+    cache1 = LRUCache()
+    cache2 = LRUCache()
+    cache1.set("key1", "value1")
+    assert cache1 is not cache2
+    assert cache2.get("key1") is None
+
+def test_invalid_maxsize():
+    """A cache that can hold nothing is a configuration error."""
+    with pytest.raises(ValueError):
+        LRUCache(maxsize=0)
+
+def test_set_and_get_basic(cache_instance):
+    """Test setting and retrieving a simple value."""
+    cache_instance.set("key1", "value1")
+    assert cache_instance.get("key1") == "value1"
+    assert "key1" in cache_instance
+    assert len(cache_instance) == 1
+
+def test_get_non_existent_key(cache_instance):
+    """Test retrieving a key that doesn't exist, expecting the default."""
+    assert cache_instance.get("non_existent") is None
+    assert cache_instance.get("non_existent", default="default_value") == "default_value"
+    assert "non_existent" not in cache_instance
+
+def test_evicts_least_recently_set(cache_instance):
+    """Inserting past maxsize drops the oldest entry."""
+    for i in range(4):
+        cache_instance.set(f"key{i}", i)
+    assert len(cache_instance) == 3
+    assert "key0" not in cache_instance
+    assert cache_instance.get("key3") == 3
+
+def test_get_refreshes_recency(cache_instance):
+    """A read moves the key to the most recently used position."""
+    cache_instance.set("key0", 0)
+    cache_instance.set("key1", 1)
+    cache_instance.set("key2", 2)
+    assert cache_instance.get("key0") == 0
+    cache_instance.set("key3", 3)
+    assert "key0" in cache_instance
+    assert "key1" not in cache_instance
+
+def test_delete_key(cache_instance):
+    """Test deleting a key."""
+    cache_instance.set("key_to_delete", "some_value")
+    assert cache_instance.delete("key_to_delete") is True
+    assert cache_instance.delete("key_to_delete") is False
+    assert cache_instance.get("key_to_delete") is None
+
+def test_clear_cache(cache_instance):
+    """Test clearing the entire cache."""
+    cache_instance.set("key1", "value1")
+    cache_instance.set("key2", "value2")
+    cache_instance.clear()
+    assert len(cache_instance) == 0
+    assert cache_instance.get("key1") is None
+
+def test_ttl_expiration():
+    """Test that entries expire after the cache TTL."""
+    cache = LRUCache(maxsize=3, ttl=0.1)
+    cache.set("ttl_key", "expires")
+    assert cache.get("ttl_key") == "expires"
+
+    time.sleep(0.15)
+
+    assert "ttl_key" not in cache
+    assert cache.get("ttl_key") is None
+    assert len(cache) == 0
+
+
+def test_missing_sentinel_distinguishes_stored_none():
+    """get() with MISSING tells a stored None apart from an absent key."""
+    cache = LRUCache(maxsize=3)
+    cache.set("none_key", None)
+    assert cache.get("none_key", MISSING) is None
+    assert cache.get("absent_key", MISSING) is MISSING
+
+
+# --- cache_key Tests ---
+
+def test_cache_key_ignores_whitespace_differences():
+    """Strings differing only in whitespace share a key."""
+    assert cache_key("python", "a  web\nscraper ") == cache_key("python", "a web scraper")
+
+def test_cache_key_depends_on_position_and_value():
+    """Different or reordered values produce different keys."""
+    assert cache_key("a", "b") != cache_key("b", "a")
+    assert cache_key("a", None) != cache_key("a", "None")
+
+
+# --- Thread Safety Tests ---
+
+def test_concurrent_set_respects_maxsize():
+    """Concurrent writers never push the cache past its bound."""
+    cache = LRUCache(maxsize=50)
+
+    def worker(offset):
+        for i in range(200):
+            cache.set(f"thread_{offset}_key_{i}", i)
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(cache) == 50
@@ -0,0 +1,223 @@
+"""Tests for the SDE Agent."""
+
+import asyncio
+import importlib
+import inspect
+import json
+import sys
+from types import MappingProxyType, SimpleNamespace
+
+from google.adk.sessions import InMemorySessionService
+from google.genai import types
+import pytest
+
+from common.types import (
+    Message,
+    SendTaskStreamingRequest,
+    TaskArtifactUpdateEvent,
+    TaskSendParams,
+    TaskState,
+    TextPart,
+)
+from implementation.sde_agent import agent as sde_agent
+from implementation.sde_agent.agent import BoundedSessionService, SDEAgent
+
+
+class FakeEvent:
+    """A runner event carrying the given parts."""
+
+    def __init__(self, *parts: types.Part, final: bool = False):
+        self.content = types.Content(role="model", parts=list(parts)) if parts else None
+        self._final = final
+
+    def is_final_response(self) -> bool:
+        return self._final
+
+
+class FakeSessionService:
+    """Session service with the sync get/create API the agent calls."""
+
+    def get_session(self, *, app_name, user_id, session_id, **kwargs):
+        return SimpleNamespace(id=session_id)
+
+    def create_session(self, *, app_name, user_id, state=None, session_id=None, **kwargs):
+        return SimpleNamespace(id=session_id)
+
+
+class FakeRunner:
+    """Replays events from run_async(), optionally failing afterwards, and records when it is closed."""
+
+    def __init__(self, events, error: Exception | None = None):
+        self.events = events
+        self.error = error
+        self.closed = False
+        self.session_service = FakeSessionService()
+
+    async def run_async(self, **kwargs):
+        try:
+            for event in self.events:
+                await asyncio.sleep(0)
+                yield event
+            if self.error:
+                raise self.error
+        finally:
+            self.closed = True
+
+
+def _agent(runner: FakeRunner) -> SDEAgent:
+    """An SDEAgent wired to the given runner, without building the LLM agent."""
+    agent = SDEAgent.__new__(SDEAgent)
+    agent._user_id = "remote_agent"
+    agent._runner = runner
+    agent._session_kwargs = MappingProxyType({"app_name": "sde_agent", "user_id": "remote_agent"})
+    return agent
+
+
+def _collect(agent: SDEAgent) -> list:
+    async def run():
+        return [item async for item in agent.stream("query", "session")]
+
+    return asyncio.run(run())
+
+
+def _text_event(text: str) -> FakeEvent:
+    return FakeEvent(types.Part.from_text(text=text), final=True)
+
+
+def _function_response_event(name: str, response: dict) -> FakeEvent:
+    return FakeEvent(types.Part.from_function_response(name=name, response=response), final=True)
+
+
+SOLUTION = {"task_id": "task-1", "code": "print(1)", "test_status": "passed", "task_details": {"lang": "py"}}
+
+
+# --- Stream Tests ---
+
+def test_stream_delivers_events_in_order():
+    """Events pass through the queue in the order the runner produced them."""
+    runner = FakeRunner([FakeEvent(), _text_event("one"), FakeEvent(), _text_event("two"), _text_event("three")])
+    items = _collect(_agent(runner))
+    assert [item["content"] for item in items if item["is_task_complete"]] == ["one", "two", "three"]
+    assert items[-1]["is_task_complete"]
+    assert runner.closed
+
+def test_stream_reraises_runner_error():
+    """An exception raised by the runner reaches the consumer."""
+    runner = FakeRunner([FakeEvent()], error=RuntimeError("runner failed"))
+    with pytest.raises(RuntimeError, match="runner failed"):
+        _collect(_agent(runner))
+
+def test_closing_stream_early_closes_runner():
+    """Closing the stream cancels the producer and closes the runner's generator before returning."""
+    runner = FakeRunner([FakeEvent()] * 1000)
+
+    async def run():
+        stream = _agent(runner).stream("query", "session")
+        first = await anext(stream)
+        await stream.aclose()
+        return first, runner.closed
+
+    first, closed = asyncio.run(run())
+    assert not first["is_task_complete"]
+    assert closed
+
+
+# --- SOLUTION_AS_JSON Tests ---
+
+def test_solution_as_json_encodes_only_the_solution(monkeypatch):
+    """With the flag on, a return_solution response is delivered as the solution's JSON."""
+    monkeypatch.setattr(sde_agent, "SOLUTION_AS_JSON", True)
+    [item] = _collect(_agent(FakeRunner([_function_response_event("return_solution", SOLUTION)])))
+    assert item["mime_type"] == "application/json"
+    assert json.loads(item["content"]) == SOLUTION
+
+def test_solution_as_json_leaves_other_tools_as_dict(monkeypatch):
+    """With the flag on, other function responses are still delivered as a dict."""
+    monkeypatch.setattr(sde_agent, "SOLUTION_AS_JSON", True)
+    [item] = _collect(_agent(FakeRunner([_function_response_event("run_tests", {"status": "passed"})])))
+    assert "mime_type" not in item
+    assert item["content"]["name"] == "run_tests"
+    assert item["content"]["response"] == {"status": "passed"}
+
+def test_task_manager_completes_with_json_solution(monkeypatch):
+    """The task manager forwards the JSON solution as a completed text artifact."""
+    monkeypatch.setattr(sde_agent, "SOLUTION_AS_JSON", True)
+    # task_manager.py imports the agent module by its script name.
+    monkeypatch.setitem(sys.modules, "agent", sde_agent)
+    monkeypatch.delitem(sys.modules, "implementation.sde_agent.task_manager", raising=False)
+    task_manager = importlib.import_module("implementation.sde_agent.task_manager")
+    manager = task_manager.AgentTaskManager(
+        _agent(FakeRunner([_function_response_event("return_solution", SOLUTION)]))
+    )
+    request = SendTaskStreamingRequest(
+        id="1",
+        params=TaskSendParams(
+            id="task", sessionId="session", message=Message(role="user", parts=[TextPart(text="query")])
+        ),
+    )
+
+    async def run():
+        responses = await manager.on_send_task_subscribe(request)
+        return [response async for response in responses]
+
+    responses = asyncio.run(run())
+    assert all(response.error is None for response in responses)
+    assert responses[0].result.status.state == TaskState.COMPLETED
+    [artifact] = [r.result.artifact for r in responses if isinstance(r.result, TaskArtifactUpdateEvent)]
+    [part] = artifact.parts
+    assert part.metadata == {"mimeType": "application/json"}
+    assert json.loads(part.text) == SOLUTION
+
+
+# --- BoundedSessionService Tests ---
+
+requires_sync_sessions = pytest.mark.skipif(
+    inspect.iscoroutinefunction(InMemorySessionService.create_session),
+    reason="requires the sync session API of google-adk 0.0.3 pinned in uv.lock",
+)
+
+
+def _session_ids(service: BoundedSessionService) -> set[str]:
+    return set(service.sessions.get("app", {}).get("user", {}))
+
+
+def _create(service: BoundedSessionService, session_id: str):
+    return service.create_session(app_name="app", user_id="user", session_id=session_id)
+
+
+@requires_sync_sessions
+def test_bounded_sessions_evict_oldest_at_limit():
+    """Creating past the limit evicts sessions in creation order."""
+    service = BoundedSessionService(max_sessions=2)
+    for session_id in ("a", "b", "c"):
+        _create(service, session_id)
+    assert _session_ids(service) == {"b", "c"}
+    _create(service, "d")
+    assert _session_ids(service) == {"c", "d"}
+
+@requires_sync_sessions
+def test_bounded_sessions_get_marks_most_recent():
+    """get_session moves a session to most-recently-used, so it outlives newer ones."""
+    service = BoundedSessionService(max_sessions=2)
+    _create(service, "a")
+    _create(service, "b")
+    assert service.get_session(app_name="app", user_id="user", session_id="a") is not None
+    _create(service, "c")
+    assert _session_ids(service) == {"a", "c"}
+
+@requires_sync_sessions
+def test_bounded_sessions_delete_clears_recency():
+    """delete_session drops the recency entry, so the freed slot isn't charged against the limit."""
+    service = BoundedSessionService(max_sessions=2)
+    _create(service, "a")
+    _create(service, "b")
+    service.delete_session(app_name="app", user_id="user", session_id="a")
+    assert ("app", "user", "a") not in service._recency
+    _create(service, "c")
+    assert _session_ids(service) == {"b", "c"}
+
+@pytest.mark.parametrize("max_sessions", [0, -1])
+def test_bounded_sessions_rejects_non_positive_limit(max_sessions):
+    """A limit below one raises ValueError."""
+    with pytest.raises(ValueError, match="max_sessions must be positive"):
+        BoundedSessionService(max_sessions=max_sessions)